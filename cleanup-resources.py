@@ -1,36 +1,74 @@
 #!/usr/bin/env python3
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+
+# Adaptive retries absorb throttling from the bulk deletes, and the
+# large pool keeps the concurrent bucket workers from exhausting the
+# default 10-connection urllib3 pool
+COMMON_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60
+)
 
 def delete_all_object_versions(bucket_name, region):
     """Delete all object versions and delete markers from a bucket"""
-    s3 = boto3.client('s3', region_name=region)
-    
+    s3 = boto3.client('s3', region_name=region, config=COMMON_CONFIG)
+
     try:
-        # List all object versions
-        response = s3.list_object_versions(Bucket=bucket_name)
-        
-        # Delete all versions
-        if 'Versions' in response:
-            for version in response['Versions']:
-                s3.delete_object(
-                    Bucket=bucket_name,
-                    Key=version['Key'],
-                    VersionId=version['VersionId']
-                )
-                print(f"Deleted version: {version['Key']} ({version['VersionId']})")
-        
-        # Delete all delete markers
-        if 'DeleteMarkers' in response:
-            for marker in response['DeleteMarkers']:
-                s3.delete_object(
-                    Bucket=bucket_name,
-                    Key=marker['Key'],
-                    VersionId=marker['VersionId']
-                )
-                print(f"Deleted marker: {marker['Key']} ({marker['VersionId']})")
-        
+        # Collect versions and delete markers page by page, deleting in
+        # batches of 1000 (the delete_objects maximum) instead of one
+        # request per version
+        paginator = s3.get_paginator('list_object_versions')
+        batch = []
+        deleted = 0
+        failed = 0
+
+        def flush(batch):
+            # Quiet mode only suppresses per-key successes; failures
+            # still come back in the Errors list of the 200 response
+            nonlocal deleted, failed
+            response = s3.delete_objects(
+                Bucket=bucket_name,
+                Delete={'Objects': batch, 'Quiet': True}
+            )
+            errors = response.get('Errors', [])
+            for error in errors[:5]:
+                print(f"Failed to delete {error['Key']} "
+                      f"(version {error.get('VersionId', '-')}) from "
+                      f"{bucket_name}: {error.get('Code')}")
+            if len(errors) > 5:
+                print(f"... and {len(errors) - 5} more delete failures "
+                      f"in {bucket_name}")
+            failed += len(errors)
+            deleted += len(batch) - len(errors)
+
+        for page in paginator.paginate(Bucket=bucket_name):
+            for version in page.get('Versions', []) + page.get('DeleteMarkers', []):
+                batch.append({
+                    'Key': version['Key'],
+                    'VersionId': version['VersionId']
+                })
+                if len(batch) == 1000:
+                    flush(batch)
+                    batch = []
+
+        # Flush the remaining partial batch
+        if batch:
+            flush(batch)
+
+        print(f"Deleted {deleted} versions/markers from {bucket_name}")
+
+        if failed:
+            print(f"{failed} versions/markers in {bucket_name} could not "
+                  f"be deleted; leaving the bucket in place")
+            return
+
         # Now delete the bucket
         s3.delete_bucket(Bucket=bucket_name)
         print(f"Deleted bucket: {bucket_name}")
@@ -43,7 +81,7 @@ def delete_all_object_versions(bucket_name, region):
 
 def delete_iam_role():
     """Delete the replication IAM role"""
-    iam = boto3.client('iam')
+    iam = boto3.client('iam', config=COMMON_CONFIG)
     role_name = "S3-Replication-Role"
     
     try:
@@ -73,8 +111,10 @@ def main():
         ("migration-demo-target-eu-west-1-36714", "eu-west-1")
     ]
     
-    for bucket, region in buckets:
-        delete_all_object_versions(bucket, region)
+    # Buckets live in different regions and are independent, so empty and
+    # delete them concurrently (each worker builds its own S3 client)
+    with ThreadPoolExecutor(max_workers=len(buckets)) as executor:
+        list(executor.map(lambda args: delete_all_object_versions(*args), buckets))
     
     # Delete IAM role
     delete_iam_role()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+"""Shared helpers for the migration scripts."""
+
+from botocore.config import Config
+
+# Shared client configuration for every boto3 client/resource in the
+# migration scripts: adaptive retries smooth out S3/DynamoDB throttling,
+# and the large pool keeps parallel workers from exhausting the urllib3
+# connection pool (default is only 10)
+COMMON_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60
+)
+
+def load_kv(path):
+    """Parse a KEY=value info file (bucket-info.txt / dynamodb-info.txt)"""
+    with open(path) as f:
+        return dict(
+            line.strip().split('=', 1)
+            for line in f
+            if '=' in line and not line.startswith('#')
+        )
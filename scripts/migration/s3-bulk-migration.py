@@ -1,34 +1,72 @@
 #!/usr/bin/env python3
 
 import boto3
+import csv
+import gzip
+import io
+import logging
+import sys
 import threading
 import time
 import os
 import hashlib
+from urllib.parse import unquote
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from boto3.s3.transfer import TransferConfig
+from _config import COMMON_CONFIG, load_kv
 from botocore.exceptions import ClientError
 import json
 from datetime import datetime
 
+# Objects at or above this size are copied with the managed transfer
+# API, which splits the copy into parallel multipart UploadPartCopy
+# calls (single-part copy_object also caps out at 5 GB)
+LARGE_OBJECT_THRESHOLD = 100 * 1024 * 1024
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=64 * 1024 * 1024,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Per-object messages go through a logger at DEBUG so a million-object
+# run doesn't pay one stdout write per copy; progress and errors stay
+# visible at the default INFO level
+logger = logging.getLogger('migrator')
+
 class S3BulkMigrator:
-    def __init__(self, source_bucket, source_region, target_configs):
+    def __init__(self, source_bucket, source_region, target_configs,
+                 inventory_manifest=None):
         """
         Initialize S3 Bulk Migrator
-        
+
         target_configs: [
             {"bucket": "target-bucket-1", "region": "us-west-2"},
             {"bucket": "target-bucket-2", "region": "eu-west-1"}
         ]
+
+        inventory_manifest: optional {"bucket": ..., "key": ...} pointing
+        at an S3 Inventory manifest.json; when given, the object listing
+        is read from the inventory CSV shards instead of paginating
+        ListObjectsV2 over the whole bucket
         """
         self.source_bucket = source_bucket
         self.source_region = source_region
         self.target_configs = target_configs
-        self.source_s3 = boto3.client('s3', region_name=source_region)
-        
+        self.inventory_manifest = inventory_manifest
+
+        # One cached client per region, shared by all worker threads
+        self._client_config = COMMON_CONFIG
+        self._client_cache = {}
+        self._client_lock = threading.Lock()
+        self.source_s3 = self._get_client(source_region)
+
         # Statistics tracking
         self.stats = {
             'total_objects': 0,
             'successful_copies': 0,
+            'skipped_copies': 0,
             'failed_copies': 0,
             'bytes_transferred': 0,
             'start_time': None,
@@ -38,30 +76,74 @@ class S3BulkMigrator:
         # Thread lock for statistics
         self.stats_lock = threading.Lock()
         
+    def _get_client(self, region):
+        """Return the cached S3 client for a region, creating it once"""
+        client = self._client_cache.get(region)
+        if client is None:
+            with self._client_lock:
+                client = self._client_cache.get(region)
+                if client is None:
+                    client = boto3.client('s3', region_name=region,
+                                          config=self._client_config)
+                    self._client_cache[region] = client
+        return client
+
+    def _list_from_inventory(self):
+        """Yield objects from the S3 Inventory CSV shards
+
+        Reading inventory costs one GET per shard (each covering a few
+        hundred thousand objects) instead of one LIST call per 1000
+        objects, so listing a huge bucket starts in seconds.
+        """
+        s3 = self._get_client(self.source_region)
+        manifest = json.loads(s3.get_object(
+            Bucket=self.inventory_manifest['bucket'],
+            Key=self.inventory_manifest['key']
+        )['Body'].read())
+
+        schema = [column.strip() for column in manifest['fileSchema'].split(',')]
+        key_idx = schema.index('Key')
+        size_idx = schema.index('Size')
+        etag_idx = schema.index('ETag')
+        modified_idx = schema.index('LastModifiedDate')
+
+        for shard in manifest['files']:
+            body = s3.get_object(
+                Bucket=self.inventory_manifest['bucket'],
+                Key=shard['key']
+            )['Body'].read()
+            text = gzip.decompress(body).decode('utf-8')
+            for row in csv.reader(io.StringIO(text)):
+                yield {
+                    # Inventory URL-encodes object keys
+                    'key': unquote(row[key_idx]),
+                    'size': int(row[size_idx]),
+                    'last_modified': row[modified_idx],
+                    'etag': row[etag_idx]
+                }
+
     def list_all_objects(self):
-        """List all objects in source bucket"""
-        print(f"📋 Scanning source bucket: {self.source_bucket}")
-        objects = []
-        
+        """Yield objects from the source bucket as listing pages arrive"""
+        logger.info(f"📋 Scanning source bucket: {self.source_bucket}")
+
         try:
+            if self.inventory_manifest:
+                yield from self._list_from_inventory()
+                return
+
             paginator = self.source_s3.get_paginator('list_objects_v2')
             for page in paginator.paginate(Bucket=self.source_bucket):
                 if 'Contents' in page:
                     for obj in page['Contents']:
-                        objects.append({
+                        yield {
                             'key': obj['Key'],
                             'size': obj['Size'],
                             'last_modified': obj['LastModified'],
                             'etag': obj['ETag']
-                        })
-                        
-            self.stats['total_objects'] = len(objects)
-            print(f"📊 Found {len(objects)} objects to migrate")
-            return objects
-            
+                        }
+
         except ClientError as e:
-            print(f"❌ Error listing objects: {e}")
-            return []
+            logger.error(f"❌ Error listing objects: {e}")
     
     def copy_object_to_target(self, obj_info, target_config):
         """Copy single object to target bucket with metadata preservation"""
@@ -70,40 +152,53 @@ class S3BulkMigrator:
         target_region = target_config['region']
         
         try:
-            target_s3 = boto3.client('s3', region_name=target_region)
-            
-            # Get object metadata from source
-            head_response = self.source_s3.head_object(
-                Bucket=self.source_bucket, 
-                Key=key
-            )
-            
+            target_s3 = self._get_client(target_region)
+
+            # Skip the copy if the target already holds an identical object
+            # (retry/incremental runs): a HEAD is tens of ms versus seconds
+            # for a cross-region copy
+            if self._already_replicated(target_s3, target_bucket, obj_info):
+                with self.stats_lock:
+                    self.stats['skipped_copies'] += 1
+                logger.debug(f"⏭️  Skipped {key} (already in {target_bucket})")
+                return True
+
             # Copy source for cross-region copy
             copy_source = {
                 'Bucket': self.source_bucket,
-                'Key': key,
-                'Region': self.source_region
+                'Key': key
             }
-            
-            # Perform the copy with metadata preservation
-            target_s3.copy_object(
-                CopySource=copy_source,
-                Bucket=target_bucket,
-                Key=key,
-                MetadataDirective='COPY'
-            )
+
+            if obj_info['size'] >= LARGE_OBJECT_THRESHOLD:
+                # Managed transfer: parallel multipart copy saturates
+                # cross-region bandwidth per object
+                target_s3.copy(
+                    copy_source,
+                    target_bucket,
+                    key,
+                    SourceClient=self.source_s3,
+                    Config=TRANSFER_CONFIG
+                )
+            else:
+                # Single-part copy with metadata preservation
+                target_s3.copy_object(
+                    CopySource=copy_source,
+                    Bucket=target_bucket,
+                    Key=key,
+                    MetadataDirective='COPY'
+                )
             
             # Update statistics
             with self.stats_lock:
                 self.stats['successful_copies'] += 1
                 self.stats['bytes_transferred'] += obj_info['size']
             
-            print(f"✅ Copied {key} to {target_bucket} ({self._format_bytes(obj_info['size'])})")
+            logger.debug(f"✅ Copied {key} to {target_bucket} ({self._format_bytes(obj_info['size'])})")
             return True
             
         except ClientError as e:
             error_msg = f"Failed to copy {key} to {target_bucket}: {e}"
-            print(f"❌ {error_msg}")
+            logger.error(f"❌ {error_msg}")
             
             with self.stats_lock:
                 self.stats['failed_copies'] += 1
@@ -111,44 +206,73 @@ class S3BulkMigrator:
             
             return False
     
-    def migrate_object_to_all_targets(self, obj_info):
-        """Migrate single object to all target buckets"""
-        results = []
-        for target_config in self.target_configs:
-            success = self.copy_object_to_target(obj_info, target_config)
-            results.append(success)
-        return all(results)
-    
+    def _already_replicated(self, target_s3, target_bucket, obj_info):
+        """Check whether the target already holds an identical copy"""
+        # ETag is only an MD5 for single-part uploads, so multipart
+        # ETags (containing '-') can't be compared reliably; inventory
+        # rows carry ETags without the surrounding quotes
+        etag = obj_info['etag'].strip('"')
+        if '-' in etag:
+            return False
+
+        try:
+            response = target_s3.head_object(
+                Bucket=target_bucket,
+                Key=obj_info['key']
+            )
+        except ClientError:
+            return False
+
+        return (response['ETag'].strip('"') == etag and
+                response['ContentLength'] == obj_info['size'])
+
     def run_migration(self, max_workers=5):
         """Execute bulk migration with parallel processing"""
         print(f"🚀 Starting bulk migration with {max_workers} workers")
         self.stats['start_time'] = datetime.now()
         
-        # Get all objects to migrate
-        objects = self.list_all_objects()
-        if not objects:
-            print("❌ No objects found to migrate")
-            return False
-        
-        # Parallel migration
+        # Parallel migration with bounded submission: copies start as soon as
+        # the first listing page arrives, and only O(workers) objects are
+        # held in memory instead of the full bucket listing. Each
+        # (object, target) pair is its own task, so the two target regions
+        # copy concurrently instead of back to back per object.
+        max_in_flight = max_workers * 4
+        completed = 0
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self.migrate_object_to_all_targets, obj): obj 
-                for obj in objects
-            }
-            
-            completed = 0
-            for future in as_completed(futures):
+            in_flight = {}
+
+            def total_copies():
+                return self.stats['total_objects'] * len(self.target_configs)
+
+            def drain_one():
+                nonlocal completed
+                future = next(as_completed(in_flight))
+                obj = in_flight.pop(future)
                 completed += 1
-                obj = futures[future]
-                
                 try:
-                    success = future.result()
-                    if completed % 10 == 0 or completed == len(objects):
-                        self._print_progress(completed, len(objects))
-                        
+                    future.result()
+                    if completed % 10 == 0:
+                        self._print_progress(completed, total_copies())
                 except Exception as e:
-                    print(f"❌ Unexpected error with {obj['key']}: {e}")
+                    logger.error(f"❌ Unexpected error with {obj['key']}: {e}")
+
+            for obj in self.list_all_objects():
+                self.stats['total_objects'] += 1
+                for target_config in self.target_configs:
+                    if len(in_flight) >= max_in_flight:
+                        drain_one()
+                    in_flight[executor.submit(
+                        self.copy_object_to_target, obj, target_config)] = obj
+
+            while in_flight:
+                drain_one()
+
+        if self.stats['total_objects'] == 0:
+            print("❌ No objects found to migrate")
+            return False
+
+        self._print_progress(completed, total_copies())
         
         # Final statistics
         self._print_final_stats()
@@ -157,7 +281,7 @@ class S3BulkMigrator:
     def _print_progress(self, completed, total):
         """Print migration progress"""
         percentage = (completed / total) * 100
-        print(f"📊 Progress: {completed}/{total} objects ({percentage:.1f}%)")
+        logger.info(f"📊 Progress: {completed}/{total} objects ({percentage:.1f}%)")
     
     def _print_final_stats(self):
         """Print final migration statistics"""
@@ -169,6 +293,7 @@ class S3BulkMigrator:
         print("="*50)
         print(f"Total Objects: {self.stats['total_objects']}")
         print(f"Successful Copies: {self.stats['successful_copies']}")
+        print(f"Skipped (already replicated): {self.stats['skipped_copies']}")
         print(f"Failed Copies: {self.stats['failed_copies']}")
         print(f"Data Transferred: {self._format_bytes(self.stats['bytes_transferred'])}")
         print(f"Duration: {duration:.2f} seconds")
@@ -194,24 +319,21 @@ def main():
     
     # Load bucket configuration
     try:
-        with open('bucket-info.txt', 'r') as f:
-            content = f.read()
-            
-        # Parse source bucket info
-        for line in content.split('\n'):
-            if line.startswith('SOURCE_BUCKET='):
-                source_bucket = line.split('=')[1]
-            elif line.startswith('SOURCE_REGION='):
-                source_region = line.split('=')[1]
-                
-        # Define target configurations
+        cfg = load_kv('bucket-info.txt')
+        source_bucket = cfg['SOURCE_BUCKET']
+        source_region = cfg['SOURCE_REGION']
+
+        # Define target configurations; names come straight from
+        # bucket-info.txt (falling back to derivation for older files)
         target_configs = [
             {
-                "bucket": source_bucket.replace('source', 'target-us-west-2'),
+                "bucket": cfg.get('TARGET_US_WEST_2_BUCKET',
+                                  source_bucket.replace('source', 'target-us-west-2')),
                 "region": "us-west-2"
             },
             {
-                "bucket": source_bucket.replace('source', 'target-eu-west-1'), 
+                "bucket": cfg.get('TARGET_EU_WEST_1_BUCKET',
+                                  source_bucket.replace('source', 'target-eu-west-1')),
                 "region": "eu-west-1"
             }
         ]
@@ -236,4 +358,8 @@ def main():
     return success
 
 if __name__ == "__main__":
+    # Log to stdout so progress lands on the same stream as the banner
+    # and final-stats prints instead of interleaving stdout and stderr
+    logging.basicConfig(level=logging.INFO, format='%(message)s',
+                        stream=sys.stdout)
     main()
\ No newline at end of file
@@ -2,20 +2,27 @@
 
 import boto3
 import json
+import time
 from botocore.exceptions import ClientError
+from _config import COMMON_CONFIG, load_kv
 
 class S3ReplicationSetup:
+
+    ROLE_NAME = "S3-Replication-Role"
+
     def __init__(self, source_bucket, source_region):
         self.source_bucket = source_bucket
         self.source_region = source_region
-        self.s3_client = boto3.client('s3', region_name=source_region)
-        self.iam_client = boto3.client('iam', region_name=source_region)
+        self.s3_client = boto3.client('s3', region_name=source_region,
+                                      config=COMMON_CONFIG)
+        self.iam_client = boto3.client('iam', region_name=source_region,
+                                       config=COMMON_CONFIG)
         
     def create_replication_role(self):
         """Create IAM role for S3 Cross-Region Replication"""
         
-        role_name = "S3-Replication-Role"
-        
+        role_name = self.ROLE_NAME
+
         # Trust policy for S3 service
         trust_policy = {
             "Version": "2012-10-17",
@@ -64,7 +71,8 @@ class S3ReplicationSetup:
     def enable_versioning(self, bucket, region):
         """Enable versioning on bucket (required for replication)"""
         try:
-            s3_client = boto3.client('s3', region_name=region)
+            s3_client = boto3.client('s3', region_name=region,
+                                     config=COMMON_CONFIG)
             s3_client.put_bucket_versioning(
                 Bucket=bucket,
                 VersioningConfiguration={'Status': 'Enabled'}
@@ -110,19 +118,49 @@ class S3ReplicationSetup:
             }
             replication_config['Rules'].append(rule)
         
-        try:
-            self.s3_client.put_bucket_replication(
-                Bucket=self.source_bucket,
-                ReplicationConfiguration=replication_config
-            )
-            print(f"✅ Configured replication for {self.source_bucket}")
-            return True
-            
-        except ClientError as e:
-            print(f"❌ Error setting up replication: {e}")
-            # Print more detailed error information
-            print(f"🔍 Error details: {e.response.get('Error', {})}")
-            return False
+        # Retry while IAM propagation still prevents S3 from assuming the
+        # replication role; most runs succeed on the first attempt
+        delay = 0.25
+        for attempt in range(6):
+            try:
+                self.s3_client.put_bucket_replication(
+                    Bucket=self.source_bucket,
+                    ReplicationConfiguration=replication_config
+                )
+                print(f"✅ Configured replication for {self.source_bucket}")
+                return True
+
+            except ClientError as e:
+                error = e.response.get('Error', {})
+                if (attempt < 5 and
+                        error.get('Code') == 'InvalidRequest' and
+                        'Unable to assume role' in error.get('Message', '')):
+                    print(f"⏳ Role not assumable yet, retrying in {delay:.2f}s...")
+                    time.sleep(delay)
+                    delay = min(delay * 2, 8.0)
+                    continue
+
+                print(f"❌ Error setting up replication: {e}")
+                # Print more detailed error information
+                print(f"🔍 Error details: {error}")
+                return False
+
+        return False
+
+    def wait_for_role(self, role_name, timeout=30):
+        """Poll IAM until the role is visible instead of sleeping blindly"""
+        delay = 0.05
+        deadline = time.time() + timeout
+
+        while True:
+            try:
+                self.iam_client.get_role(RoleName=role_name)
+                return True
+            except ClientError:
+                if time.time() >= deadline:
+                    return False
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
     
     def setup_complete_replication(self, target_configs):
         """Complete replication setup process"""
@@ -142,11 +180,10 @@ class S3ReplicationSetup:
                 return False
         
         # Step 3: Setup replication configuration
-        # Wait a moment for role to be ready
-        import time
+        # Wait only as long as IAM actually takes to propagate the role
         print("⏳ Waiting for IAM role to be ready...")
-        time.sleep(10)
-        
+        self.wait_for_role(self.ROLE_NAME)
+
         if not self.setup_replication_configuration(target_configs, role_arn):
             return False
         
@@ -159,22 +196,21 @@ def main():
     
     # Load configuration
     try:
-        with open('bucket-info.txt', 'r') as f:
-            content = f.read()
-            
-        for line in content.split('\n'):
-            if line.startswith('SOURCE_BUCKET='):
-                source_bucket = line.split('=')[1]
-            elif line.startswith('SOURCE_REGION='):
-                source_region = line.split('=')[1]
-                
+        cfg = load_kv('bucket-info.txt')
+        source_bucket = cfg['SOURCE_BUCKET']
+        source_region = cfg['SOURCE_REGION']
+
+        # Target names come straight from bucket-info.txt (falling back
+        # to derivation for older files)
         target_configs = [
             {
-                "bucket": source_bucket.replace('source', 'target-us-west-2'),
+                "bucket": cfg.get('TARGET_US_WEST_2_BUCKET',
+                                  source_bucket.replace('source', 'target-us-west-2')),
                 "region": "us-west-2"
             },
             {
-                "bucket": source_bucket.replace('source', 'target-eu-west-1'),
+                "bucket": cfg.get('TARGET_EU_WEST_1_BUCKET',
+                                  source_bucket.replace('source', 'target-eu-west-1')),
                 "region": "eu-west-1"
             }
         ]
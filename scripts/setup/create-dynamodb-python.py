@@ -3,6 +3,7 @@
 import boto3
 import time
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 
 def create_dynamodb_table(table_name, region):
     """Create a DynamoDB table in specified region"""
@@ -50,9 +51,11 @@ def create_dynamodb_table(table_name, region):
         
         print(f"⏳ Waiting for {table_name} to be active...")
         
-        # Wait for table to be created
+        # Wait for table to be created; on-demand tables usually go
+        # ACTIVE in 5-15s, so poll every 2s instead of the default 20s
         waiter = dynamodb.get_waiter('table_exists')
-        waiter.wait(TableName=table_name)
+        waiter.wait(TableName=table_name,
+                    WaiterConfig={'Delay': 2, 'MaxAttempts': 60})
         
         print(f"✅ Table {table_name} created successfully in {region}")
         return True
@@ -77,19 +80,22 @@ def main():
     
     print("🗄️  Creating DynamoDB tables for migration testing...")
     
-    # Create source table
+    # Create source and target tables concurrently: each create blocks
+    # in its table_exists waiter, so the independent waits overlap and
+    # wall time is the slowest single table instead of the sum
     source_table = f"{project_name}-user-data"
-    success = create_dynamodb_table(source_table, source_region)
-    
-    if not success:
+    tables = [(source_table, source_region)] + [
+        (f"{project_name}-target-{region}-user-data", region)
+        for region in target_regions
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        results = list(executor.map(lambda args: create_dynamodb_table(*args), tables))
+
+    if not results[0]:
         print("❌ Failed to create source table. Exiting.")
         return
     
-    # Create target tables
-    for region in target_regions:
-        target_table = f"{project_name}-target-{region}-user-data"
-        create_dynamodb_table(target_table, region)
-    
     # Save table information
     print("📝 Saving DynamoDB table information...")
     with open('dynamodb-info.txt', 'w') as f:
@@ -42,9 +42,16 @@ echo "📝 Saving bucket information..."
 cat > bucket-info.txt << EOF
 SOURCE_BUCKET=${SOURCE_BUCKET}
 SOURCE_REGION=${SOURCE_REGION}
-TARGET_BUCKETS=(
 EOF
 
+# One TARGET_<REGION>_BUCKET entry per region so the Python scripts can
+# read target names directly instead of deriving them from the source name
+for region in "${TARGET_REGIONS[@]}"; do
+    REGION_KEY=$(echo "${region}" | tr 'a-z-' 'A-Z_')
+    echo "TARGET_${REGION_KEY}_BUCKET=${PROJECT_NAME}-target-${region}-${RANDOM_SUFFIX}" >> bucket-info.txt
+done
+
+echo "TARGET_BUCKETS=(" >> bucket-info.txt
 for region in "${TARGET_REGIONS[@]}"; do
     echo "    ${PROJECT_NAME}-target-${region}-${RANDOM_SUFFIX}" >> bucket-info.txt
 done
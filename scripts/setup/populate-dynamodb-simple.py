@@ -1,20 +1,53 @@
 #!/usr/bin/env python3
 
 import boto3
+import logging
+import sys
 import time
 import json
+from boto3.dynamodb.types import TypeSerializer
+from botocore.config import Config
 from decimal import Decimal
 
-def populate_source_table():
+# Progress goes through a module logger rather than print(), so callers
+# embedding this as a library can silence, relevel, or redirect it
+logger = logging.getLogger(__name__)
+
+# Adaptive retries back off locally when the table throttles instead of
+# failing after the legacy three attempts
+CLIENT_CONFIG = Config(retries={'mode': 'adaptive', 'max_attempts': 10},
+                       tcp_keepalive=True)
+
+# Built lazily at module scope: boto3 parses the ~1 MB DynamoDB service
+# model on first construction, so repeated calls (or use as a library)
+# pay that cost once per process
+_DDB = None
+_DDB_CLIENT = None
+
+def _ddb():
+    global _DDB
+    if _DDB is None:
+        _DDB = boto3.resource('dynamodb', region_name='us-east-1',
+                              config=CLIENT_CONFIG)
+    return _DDB
+
+def _ddb_client():
+    global _DDB_CLIENT
+    if _DDB_CLIENT is None:
+        _DDB_CLIENT = boto3.client('dynamodb', region_name='us-east-1',
+                                   config=CLIENT_CONFIG)
+    return _DDB_CLIENT
+
+def populate_source_table(verify=False):
     """Populate source DynamoDB table with sample data"""
-    
+
     try:
         # Initialize DynamoDB resource
-        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        dynamodb = _ddb()
         table_name = 'migration-demo-user-data'
         table = dynamodb.Table(table_name)
         
-        print(f"📝 Populating {table_name} with sample data...")
+        logger.info(f"📝 Populating {table_name} with sample data...")
         
         # Simple sample data (using strings and numbers only)
         sample_users = [
@@ -41,46 +74,69 @@ def populate_source_table():
             }
         ]
         
-        # Insert items one by one (more reliable)
+        # Insert items with batch_write_item: up to 25 items per request,
+        # retrying only the unprocessed subset with capped exponential
+        # backoff instead of dropping throttled writes on the floor.
+        # Items are serialized once up front with TypeSerializer and sent
+        # through the low-level client, so retried batches reuse the
+        # already-serialized blobs instead of re-serializing per attempt
+        client = _ddb_client()
+        serializer = TypeSerializer()
+        pending = [
+            {'PutRequest': {'Item': {k: serializer.serialize(v)
+                                     for k, v in user.items()}}}
+            for user in sample_users
+        ]
+        backoff = 0.1
+        while pending:
+            batch, pending = pending[:25], pending[25:]
+            response = client.batch_write_item(RequestItems={table_name: batch})
+            unprocessed = response.get('UnprocessedItems', {}).get(table_name, [])
+            if unprocessed:
+                pending.extend(unprocessed)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+            else:
+                backoff = 0.1
+
+        # The script already knows exactly what it wrote, so report from
+        # the local list instead of scanning the table back (the scan
+        # costs a round trip and can miss just-written items under
+        # eventual consistency)
+        logger.info(f"Total items written: {len(sample_users)}")
         for user in sample_users:
-            try:
-                table.put_item(Item=user)
-                print(f"✅ Added user: {user['Name']} ({user['UserID']})")
-            except Exception as e:
-                print(f"❌ Error adding {user['UserID']}: {e}")
-        
-        # Verify data
-        print("📊 Verifying data insertion...")
-        response = table.scan(Limit=10)
-        print(f"Total items found: {response['Count']}")
-        
-        for item in response['Items']:
-            print(f"  - {item['Name']} ({item['UserID']})")
-        
-        print("🎉 Sample data populated successfully!")
+            logger.info(f"  - {user['Name']} ({user['UserID']})")
+
+        if verify:
+            logger.info("📊 Verifying data insertion...")
+            response = table.scan(Limit=10)
+            logger.info(f"Total items found: {response['Count']}")
+
+        logger.info("🎉 Sample data populated successfully!")
         return True
-        
+
     except Exception as e:
-        print(f"❌ Error populating table: {str(e)}")
-        print("💡 Make sure the table exists and you have proper AWS credentials")
+        logger.error(f"❌ Error populating table: {str(e)}")
+        logger.error("💡 Make sure the table exists and you have proper AWS credentials")
         return False
 
 if __name__ == "__main__":
-    # Check if boto3 is installed
-    try:
-        import boto3
-        print("✅ boto3 is available")
-    except ImportError:
-        print("❌ boto3 not installed. Run: pip3 install boto3")
-        exit(1)
-    
-    # Check AWS credentials
+    # Progress belongs on stdout like the prints it replaced; without
+    # stream= the root handler writes to stderr
+    logging.basicConfig(level=logging.INFO, format='%(message)s',
+                        stream=sys.stdout)
+
+    # Check AWS credentials; tight timeouts so a misconfigured
+    # environment fails in seconds instead of waiting out the defaults
     try:
-        sts = boto3.client('sts')
+        sts = boto3.client('sts', config=Config(
+            connect_timeout=3, read_timeout=5,
+            retries={'max_attempts': 2}))
         identity = sts.get_caller_identity()
-        print(f"✅ AWS credentials working. Account: {identity['Account']}")
+        logger.info(f"✅ AWS credentials working. Account: {identity['Account']}")
     except Exception as e:
-        print(f"❌ AWS credentials issue: {e}")
+        logger.error(f"❌ AWS credentials issue: {e}")
         exit(1)
-    
-    populate_source_table()
\ No newline at end of file
+
+    populate_source_table(verify='--verify' in sys.argv)
+    logging.shutdown()
\ No newline at end of file
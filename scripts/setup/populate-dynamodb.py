@@ -2,73 +2,101 @@
 
 import boto3
 import json
+import logging
+import sys
 import time
+from botocore.config import Config
 from datetime import datetime
 from decimal import Decimal
 
+# Logged rather than printed so library callers can adjust the level or
+# swap the handler without touching this code
+logger = logging.getLogger(__name__)
+
+# Adaptive retries back off locally when the table throttles instead of
+# failing after the legacy three attempts
+CLIENT_CONFIG = Config(retries={'mode': 'adaptive', 'max_attempts': 10},
+                       tcp_keepalive=True)
+
+# Built lazily at module scope: boto3 parses the ~1 MB DynamoDB service
+# model on first construction, so repeated calls (or use as a library)
+# pay that cost once per process
+_DDB = None
+
+def _ddb():
+    global _DDB
+    if _DDB is None:
+        _DDB = boto3.resource('dynamodb', region_name='us-east-1',
+                              config=CLIENT_CONFIG)
+    return _DDB
+
 def populate_source_table():
     """Populate source DynamoDB table with sample data"""
-    
+
     # Initialize DynamoDB resource
-    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    dynamodb = _ddb()
     table_name = 'migration-demo-user-data'
     
     try:
         table = dynamodb.Table(table_name)
         
-        print(f"📝 Populating {table_name} with sample data...")
-        
+        logger.info(f"📝 Populating {table_name} with sample data...")
+
+        # One clock read for the whole batch; offsets keep Timestamps
+        # strictly monotonic across users
+        now = int(time.time())
+
         # Sample user data
         sample_users = [
             {
                 'UserID': 'user001',
-                'Timestamp': int(time.time()),
+                'Timestamp': now,
                 'Name': 'John Doe',
                 'Email': 'john.doe@example.com',
                 'Department': 'Engineering',
                 'JoinDate': '2023-01-15',
                 'Status': 'Active',
-                'LastLogin': int(time.time()) - 3600
+                'LastLogin': now - 3600
             },
             {
                 'UserID': 'user002', 
-                'Timestamp': int(time.time()) + 1,
+                'Timestamp': now + 1,
                 'Name': 'Jane Smith',
                 'Email': 'jane.smith@example.com',
                 'Department': 'Marketing',
                 'JoinDate': '2023-03-20',
                 'Status': 'Active',
-                'LastLogin': int(time.time()) - 7200
+                'LastLogin': now - 7200
             },
             {
                 'UserID': 'user003',
-                'Timestamp': int(time.time()) + 2,
+                'Timestamp': now + 2,
                 'Name': 'Bob Johnson',
                 'Email': 'bob.johnson@example.com', 
                 'Department': 'Sales',
                 'JoinDate': '2023-06-10',
                 'Status': 'Active',
-                'LastLogin': int(time.time()) - 1800
+                'LastLogin': now - 1800
             },
             {
                 'UserID': 'user004',
-                'Timestamp': int(time.time()) + 3,
+                'Timestamp': now + 3,
                 'Name': 'Alice Brown',
                 'Email': 'alice.brown@example.com',
                 'Department': 'HR',
                 'JoinDate': '2023-08-05',
                 'Status': 'Inactive',
-                'LastLogin': int(time.time()) - 86400
+                'LastLogin': now - 86400
             },
             {
                 'UserID': 'user005',
-                'Timestamp': int(time.time()) + 4,
+                'Timestamp': now + 4,
                 'Name': 'Charlie Wilson',
                 'Email': 'charlie.wilson@example.com',
                 'Department': 'Engineering',
                 'JoinDate': '2024-01-12',
                 'Status': 'Active', 
-                'LastLogin': int(time.time()) - 600
+                'LastLogin': now - 600
             }
         ]
         
@@ -76,18 +104,23 @@ def populate_source_table():
         with table.batch_writer() as batch:
             for user in sample_users:
                 batch.put_item(Item=user)
-                print(f"✅ Added user: {user['Name']} ({user['UserID']})")
-        
-        print("📊 Verifying data insertion...")
+                logger.info(f"✅ Added user: {user['Name']} ({user['UserID']})")
+
+        logger.info("📊 Verifying data insertion...")
         response = table.scan()
-        print(f"Total items in table: {response['Count']}")
-        
-        print("🎉 Sample data populated successfully!")
+        logger.info(f"Total items in table: {response['Count']}")
+
+        logger.info("🎉 Sample data populated successfully!")
         return True
-        
+
     except Exception as e:
-        print(f"❌ Error populating table: {str(e)}")
+        logger.error(f"❌ Error populating table: {str(e)}")
         return False
 
 if __name__ == "__main__":
-    populate_source_table()
\ No newline at end of file
+    # Progress belongs on stdout like the prints it replaced; without
+    # stream= the root handler writes to stderr
+    logging.basicConfig(level=logging.INFO, format='%(message)s',
+                        stream=sys.stdout)
+    populate_source_table()
+    logging.shutdown()
\ No newline at end of file
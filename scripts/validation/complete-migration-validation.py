@@ -1,10 +1,31 @@
 #!/usr/bin/env python3
 
 import boto3
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from collections import namedtuple
+
+# orjson's C encoder is 5-10x faster than stdlib json for the report;
+# fall back silently when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Plain tuples instead of per-target dicts: lighter and attribute access
+# is cheaper than dict lookups in the per-target loops
+S3Target = namedtuple('S3Target', 'bucket region')
+DynamoTarget = namedtuple('DynamoTarget', 'table region')
+
+# The replication test writes its probe objects under this prefix; the
+# bulk-migration check ignores it so a probe uploaded mid-listing (CRR
+# still in flight) can't show up as a missing object
+VALIDATION_PREFIX = 'validation/'
 
 class MigrationValidator:
     def __init__(self):
@@ -14,48 +35,112 @@ class MigrationValidator:
             'dynamodb_sync': {},
             'overall_status': 'PENDING'
         }
-        
+
+        # One Session with memoized per-region clients: the validators
+        # used to rebuild clients inside their loops, paying the
+        # service-model load and a fresh TLS handshake every time
+        self._session = boto3.Session()
+        self._client_config = Config(
+            max_pool_connections=50,
+            retries={'mode': 'adaptive', 'max_attempts': 10},
+            tcp_keepalive=True
+        )
+        # Guards concurrent writes to self.results when the three
+        # validations run in parallel
+        self._results_lock = threading.Lock()
+        # Guards the client caches below: Session.client() is not
+        # thread-safe on a shared Session, and the parallel validations
+        # request the same region at startup
+        self._cache_lock = threading.Lock()
+        self._s3_clients = {}
+        self._dynamodb_clients = {}
+        self._dynamodb_resources = {}
+        # Parsed info files, cached so repeated load_configuration()
+        # calls don't reread and reparse them
+        self._config = None
+
+    def _s3_client(self, region):
+        """Return the cached S3 client for a region, creating it once"""
+        client = self._s3_clients.get(region)
+        if client is None:
+            with self._cache_lock:
+                client = self._s3_clients.get(region)
+                if client is None:
+                    client = self._session.client('s3', region_name=region,
+                                                  config=self._client_config)
+                    self._s3_clients[region] = client
+        return client
+
+    def _dynamodb_client(self, region):
+        """Return the cached low-level DynamoDB client for a region"""
+        client = self._dynamodb_clients.get(region)
+        if client is None:
+            with self._cache_lock:
+                client = self._dynamodb_clients.get(region)
+                if client is None:
+                    client = self._session.client('dynamodb', region_name=region,
+                                                  config=self._client_config)
+                    self._dynamodb_clients[region] = client
+        return client
+
+    def _dynamodb_resource(self, region):
+        """Return the cached DynamoDB resource for a region"""
+        resource = self._dynamodb_resources.get(region)
+        if resource is None:
+            with self._cache_lock:
+                resource = self._dynamodb_resources.get(region)
+                if resource is None:
+                    resource = self._session.resource('dynamodb',
+                                                      region_name=region,
+                                                      config=self._client_config)
+                    self._dynamodb_resources[region] = resource
+        return resource
+
+    @staticmethod
+    def _parse_env(path):
+        """Parse a KEY=value info file into a dict"""
+        with open(path) as f:
+            return dict(
+                line.strip().split('=', 1)
+                for line in f
+                if '=' in line and not line.startswith('#')
+            )
+
     def load_configuration(self):
         """Load bucket and table configuration"""
+        if self._config is not None:
+            return True
+
         try:
-            # Load S3 config
-            with open('bucket-info.txt', 'r') as f:
-                content = f.read()
-                
-            for line in content.split('\n'):
-                if line.startswith('SOURCE_BUCKET='):
-                    self.source_bucket = line.split('=')[1]
-                elif line.startswith('SOURCE_REGION='):
-                    self.source_region = line.split('=')[1]
-            
-            # Load DynamoDB config
-            with open('dynamodb-info.txt', 'r') as f:
-                content = f.read()
-                
-            for line in content.split('\n'):
-                if line.startswith('SOURCE_TABLE='):
-                    self.source_table = line.split('=')[1]
-                    
+            s3_config = self._parse_env('bucket-info.txt')
+            s3_config.update(self._parse_env('dynamodb-info.txt'))
+            self._config = s3_config
+
+            self.source_bucket = s3_config['SOURCE_BUCKET']
+            self.source_region = s3_config['SOURCE_REGION']
+            self.source_table = s3_config['SOURCE_TABLE']
+
+            # Built once per load: bucket names come straight from
+            # bucket-info.txt (with replace() only as a fallback for
+            # info files written by older runs)
             self.target_configs = {
                 's3': [
-                    {
-                        "bucket": self.source_bucket.replace('source', 'target-us-west-2'),
-                        "region": "us-west-2"
-                    },
-                    {
-                        "bucket": self.source_bucket.replace('source', 'target-eu-west-1'),
-                        "region": "eu-west-1"
-                    }
+                    S3Target(
+                        s3_config.get('TARGET_US_WEST_2_BUCKET',
+                                      self.source_bucket.replace('source', 'target-us-west-2')),
+                        'us-west-2'
+                    ),
+                    S3Target(
+                        s3_config.get('TARGET_EU_WEST_1_BUCKET',
+                                      self.source_bucket.replace('source', 'target-eu-west-1')),
+                        'eu-west-1'
+                    )
                 ],
                 'dynamodb': [
-                    {
-                        "table": "migration-demo-target-us-west-2-user-data",
-                        "region": "us-west-2"
-                    },
-                    {
-                        "table": "migration-demo-target-eu-west-1-user-data",
-                        "region": "eu-west-1"
-                    }
+                    DynamoTarget('migration-demo-target-us-west-2-user-data',
+                                 'us-west-2'),
+                    DynamoTarget('migration-demo-target-eu-west-1-user-data',
+                                 'eu-west-1')
                 ]
             }
             
@@ -70,51 +155,91 @@ class MigrationValidator:
         print("🔍 Validating S3 bulk migration...")
         
         try:
-            # Get source objects
-            source_s3 = boto3.client('s3', region_name=self.source_region)
-            source_objects = self._get_bucket_objects(source_s3, self.source_bucket)
+            # Get source objects; replication probes are excluded since
+            # the replication test may be writing one concurrently
+            source_s3 = self._s3_client(self.source_region)
+            source_objects = {
+                key for key in
+                self._get_bucket_objects(source_s3, self.source_bucket)
+                if not key.startswith(VALIDATION_PREFIX)
+            }
             
-            self.results['s3_bulk_migration']['source_count'] = len(source_objects)
-            self.results['s3_bulk_migration']['targets'] = {}
+            with self._results_lock:
+                self.results['s3_bulk_migration']['source_count'] = len(source_objects)
+                self.results['s3_bulk_migration']['targets'] = {}
             
-            # Check each target
+            # Check the targets in parallel: each check is pure I/O wait,
+            # so wall time collapses to the slowest region
             all_targets_valid = True
-            for target in self.target_configs['s3']:
-                target_s3 = boto3.client('s3', region_name=target['region'])
-                target_objects = self._get_bucket_objects(target_s3, target['bucket'])
-                
-                target_count = len(target_objects)
-                missing_objects = set(source_objects.keys()) - set(target_objects.keys())
-                
-                self.results['s3_bulk_migration']['targets'][target['bucket']] = {
-                    'count': target_count,
-                    'missing': len(missing_objects),
-                    'status': 'COMPLETE' if len(missing_objects) == 0 else 'INCOMPLETE'
+            targets = self.target_configs['s3']
+            with ThreadPoolExecutor(max_workers=len(targets) * 2) as executor:
+                futures = {
+                    executor.submit(self._validate_one_s3_target, target,
+                                    source_objects): target
+                    for target in targets
                 }
-                
-                if len(missing_objects) > 0:
-                    all_targets_valid = False
-                    print(f"⚠️  {target['bucket']}: Missing {len(missing_objects)} objects")
-                else:
-                    print(f"✅ {target['bucket']}: All {target_count} objects present")
+                for future in as_completed(futures):
+                    target = futures[future]
+                    result = future.result()
+                    with self._results_lock:
+                        self.results['s3_bulk_migration']['targets'][target.bucket] = result
+                    if result['status'] != 'COMPLETE':
+                        all_targets_valid = False
             
-            self.results['s3_bulk_migration']['status'] = 'COMPLETE' if all_targets_valid else 'INCOMPLETE'
+            with self._results_lock:
+                self.results['s3_bulk_migration']['status'] = 'COMPLETE' if all_targets_valid else 'INCOMPLETE'
             return all_targets_valid
             
         except Exception as e:
             print(f"❌ Error validating S3 bulk migration: {e}")
-            self.results['s3_bulk_migration']['status'] = 'ERROR'
+            with self._results_lock:
+                self.results['s3_bulk_migration']['status'] = 'ERROR'
             return False
     
+    def _validate_one_s3_target(self, target, source_objects):
+        """Check a single target bucket against the source listing"""
+        # Stream the target listing and cross keys off a copy of the
+        # source set page by page, stopping as soon as everything is
+        # accounted for: only the source set is held in memory, and the
+        # paginator usually short-circuits well before the full target
+        # listing (count reflects pages seen up to that point)
+        target_s3 = self._s3_client(target.region)
+        remaining = set(source_objects)
+        target_count = 0
+        try:
+            paginator = target_s3.get_paginator('list_objects_v2')
+            for page in paginator.paginate(
+                    Bucket=target.bucket, PaginationConfig={'PageSize': 1000}):
+                page_keys = {obj['Key'] for obj in page.get('Contents', ())
+                             if not obj['Key'].startswith(VALIDATION_PREFIX)}
+                target_count += len(page_keys)
+                remaining -= page_keys
+                if not remaining:
+                    break
+        except Exception as e:
+            print(f"⚠️  Warning: Could not list objects in {target.bucket}: {e}")
+
+        missing_count = len(remaining)
+        if missing_count:
+            print(f"⚠️  {target.bucket}: Missing {missing_count} objects")
+        else:
+            print(f"✅ {target.bucket}: All {target_count} objects present")
+
+        return {
+            'count': target_count,
+            'missing': missing_count,
+            'status': 'COMPLETE' if missing_count == 0 else 'INCOMPLETE'
+        }
+
     def validate_s3_replication(self):
         """Test S3 real-time replication"""
         print("🔍 Testing S3 real-time replication...")
         
         try:
-            source_s3 = boto3.client('s3', region_name=self.source_region)
-            
+            source_s3 = self._s3_client(self.source_region)
+
             # Create a unique test file
-            test_key = f"validation/replication-test-{int(time.time())}.txt"
+            test_key = f"{VALIDATION_PREFIX}replication-test-{int(time.time())}.txt"
             test_content = f"Replication validation test at {datetime.now()}"
             
             # Upload to source
@@ -127,101 +252,195 @@ class MigrationValidator:
             
             print(f"📤 Uploaded test file: {test_key}")
             
-            # Wait for replication
-            print("⏳ Waiting 60 seconds for replication...")
-            time.sleep(60)
-            
-            # Check targets
-            replication_success = True
-            for target in self.target_configs['s3']:
-                try:
-                    target_s3 = boto3.client('s3', region_name=target['region'])
-                    target_s3.head_object(Bucket=target['bucket'], Key=test_key)
-                    print(f"✅ Replication successful to {target['bucket']}")
-                except ClientError:
-                    print(f"❌ Replication failed to {target['bucket']}")
-                    replication_success = False
+            # Poll the targets instead of sleeping a fixed 60 seconds:
+            # return as soon as every target reports the test object
+            print("⏳ Waiting up to 60 seconds for replication...")
+            deadline = time.time() + 60
+            poll_delay = 1
+            pending = list(self.target_configs['s3'])
+
+            while pending and time.time() < deadline:
+                with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                    checks = {
+                        executor.submit(self._test_file_replicated, target,
+                                        test_key): target
+                        for target in pending
+                    }
+                    still_pending = []
+                    for future in as_completed(checks):
+                        target = checks[future]
+                        if future.result():
+                            print(f"✅ Replication successful to {target.bucket}")
+                        else:
+                            still_pending.append(target)
+                pending = still_pending
+
+                if pending and time.time() < deadline:
+                    time.sleep(min(poll_delay, max(0, deadline - time.time())))
+                    poll_delay = min(poll_delay * 2, 4)
+
+            for target in pending:
+                print(f"❌ Replication failed to {target.bucket}")
+            replication_success = not pending
             
-            self.results['s3_replication']['status'] = 'WORKING' if replication_success else 'FAILED'
-            self.results['s3_replication']['test_file'] = test_key
+            with self._results_lock:
+                self.results['s3_replication']['status'] = 'WORKING' if replication_success else 'FAILED'
+                self.results['s3_replication']['test_file'] = test_key
             
             return replication_success
             
         except Exception as e:
             print(f"❌ Error testing S3 replication: {e}")
-            self.results['s3_replication']['status'] = 'ERROR'
+            with self._results_lock:
+                self.results['s3_replication']['status'] = 'ERROR'
             return False
     
+    def _test_file_replicated(self, target, test_key):
+        """Check whether the replication test object reached a target"""
+        try:
+            self._s3_client(target.region).head_object(
+                Bucket=target.bucket, Key=test_key)
+            return True
+        except ClientError:
+            return False
+
     def validate_dynamodb_sync(self):
         """Validate DynamoDB synchronization"""
         print("🔍 Validating DynamoDB sync...")
         
         try:
-            # Get source data
-            source_dynamodb = boto3.resource('dynamodb', region_name=self.source_region)
-            source_table = source_dynamodb.Table(self.source_table)
-            
-            source_response = source_table.scan()
-            source_items = source_response['Items']
-            source_count = len(source_items)
-            
-            self.results['dynamodb_sync']['source_count'] = source_count
-            self.results['dynamodb_sync']['targets'] = {}
+            # Key-only scan: transfers just the primary keys rather than
+            # every attribute, follows pagination so counts are exact,
+            # and the keys feed per-target BatchGetItem checks below
+            source_keys = self._scan_source_keys()
+            source_count = len(source_keys)
+
+            with self._results_lock:
+                self.results['dynamodb_sync']['source_count'] = source_count
+                self.results['dynamodb_sync']['targets'] = {}
             
             print(f"📊 Source table has {source_count} items")
             
-            # Check each target
+            # Check the targets in parallel, mirroring the S3 validation
             all_targets_synced = True
-            for target in self.target_configs['dynamodb']:
-                try:
-                    target_dynamodb = boto3.resource('dynamodb', region_name=target['region'])
-                    target_table = target_dynamodb.Table(target['table'])
-                    
-                    target_response = target_table.scan()
-                    target_items = target_response['Items']
-                    target_count = len(target_items)
-                    
-                    # Simple count comparison (could be enhanced with data validation)
-                    sync_status = 'SYNCED' if target_count == source_count else 'OUT_OF_SYNC'
-                    
-                    self.results['dynamodb_sync']['targets'][target['table']] = {
-                        'count': target_count,
-                        'status': sync_status
-                    }
-                    
-                    if sync_status == 'SYNCED':
-                        print(f"✅ {target['table']}: {target_count} items (synced)")
-                    else:
-                        print(f"⚠️  {target['table']}: {target_count} items (expected {source_count})")
+            targets = self.target_configs['dynamodb']
+            with ThreadPoolExecutor(max_workers=len(targets) * 2) as executor:
+                futures = {
+                    executor.submit(self._validate_one_dynamodb_target, target,
+                                    source_keys): target
+                    for target in targets
+                }
+                for future in as_completed(futures):
+                    target = futures[future]
+                    result = future.result()
+                    if result is None:
+                        all_targets_synced = False
+                        continue
+                    with self._results_lock:
+                        self.results['dynamodb_sync']['targets'][target.table] = result
+                    if result['status'] != 'SYNCED':
                         all_targets_synced = False
-                        
-                except Exception as e:
-                    print(f"❌ Error checking {target['table']}: {e}")
-                    all_targets_synced = False
             
-            self.results['dynamodb_sync']['status'] = 'SYNCED' if all_targets_synced else 'OUT_OF_SYNC'
+            with self._results_lock:
+                self.results['dynamodb_sync']['status'] = 'SYNCED' if all_targets_synced else 'OUT_OF_SYNC'
             return all_targets_synced
             
         except Exception as e:
             print(f"❌ Error validating DynamoDB sync: {e}")
-            self.results['dynamodb_sync']['status'] = 'ERROR'
+            with self._results_lock:
+                self.results['dynamodb_sync']['status'] = 'ERROR'
             return False
     
+    def _count_table_items(self, region, table_name):
+        """Count a table's items with a paginated COUNT-only scan"""
+        paginator = self._dynamodb_client(region).get_paginator('scan')
+        return sum(
+            page['Count']
+            for page in paginator.paginate(TableName=table_name, Select='COUNT')
+        )
+
+    def _scan_source_keys(self):
+        """Scan only the primary-key attributes of the source table"""
+        paginator = self._dynamodb_client(self.source_region).get_paginator('scan')
+        keys = []
+        for page in paginator.paginate(
+                TableName=self.source_table,
+                ProjectionExpression='#u,#t',
+                ExpressionAttributeNames={'#u': 'UserID', '#t': 'Timestamp'}):
+            keys.extend(page['Items'])
+        return keys
+
+    def _count_present_keys(self, region, table_name, keys):
+        """Count how many of the given keys exist in a table
+
+        Uses 100-key BatchGetItem chunks with a key-only projection, so
+        verifying a target transfers key bytes rather than whole items.
+        """
+        client = self._dynamodb_client(region)
+        found = 0
+
+        for start in range(0, len(keys), 100):
+            request = {
+                table_name: {
+                    'Keys': keys[start:start + 100],
+                    'ProjectionExpression': '#u',
+                    'ExpressionAttributeNames': {'#u': 'UserID'}
+                }
+            }
+            attempt = 0
+            while request:
+                response = client.batch_get_item(RequestItems=request)
+                found += len(response['Responses'].get(table_name, []))
+                request = response.get('UnprocessedKeys') or None
+                if request:
+                    # UnprocessedKeys arrive in a 200 response, so the
+                    # retry config never backs off for us; sleep before
+                    # resubmitting the throttled remainder
+                    time.sleep(min(2 ** attempt * 0.05, 1.0))
+                    attempt += 1
+
+        return found
+
+    def _validate_one_dynamodb_target(self, target, source_keys):
+        """Verify every source key is present in one target table"""
+        try:
+            found = self._count_present_keys(target.region, target.table,
+                                             source_keys)
+            missing = len(source_keys) - found
+            target_count = self._count_table_items(target.region, target.table)
+
+            sync_status = 'SYNCED' if missing == 0 else 'OUT_OF_SYNC'
+
+            if sync_status == 'SYNCED':
+                print(f"✅ {target.table}: {target_count} items (synced)")
+            else:
+                print(f"⚠️  {target.table}: missing {missing} of "
+                      f"{len(source_keys)} source items")
+
+            return {
+                'count': target_count,
+                'missing': missing,
+                'status': sync_status
+            }
+
+        except Exception as e:
+            print(f"❌ Error checking {target.table}: {e}")
+            return None
+
     def _get_bucket_objects(self, s3_client, bucket):
-        """Get all objects in a bucket"""
-        objects = {}
+        """Get the set of object keys in a bucket"""
+        # Only the key names are ever compared, so skip the per-object
+        # size/datetime payload; PageSize=1000 requests the S3 maximum
+        # per round trip
+        objects = set()
         try:
             paginator = s3_client.get_paginator('list_objects_v2')
-            for page in paginator.paginate(Bucket=bucket):
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        objects[obj['Key']] = {
-                            'size': obj['Size'],
-                            'modified': obj['LastModified']
-                        }
+            for page in paginator.paginate(
+                    Bucket=bucket, PaginationConfig={'PageSize': 1000}):
+                objects.update(obj['Key'] for obj in page.get('Contents', ()))
         except Exception as e:
             print(f"⚠️  Warning: Could not list objects in {bucket}: {e}")
-        
+
         return objects
     
     def generate_final_report(self):
@@ -287,9 +506,14 @@ class MigrationValidator:
         print(f"   ✅ Production-ready error handling")
         print(f"   💵 Estimated Project Value: $1,500 - $2,500")
         
-        # Save report
-        with open('migration-validation-report.json', 'w') as f:
-            json.dump(self.results, f, indent=2, default=str)
+        # Save report; the results hold only counts, statuses, and key
+        # names, so no default= fallback is needed for the encoders
+        if orjson is not None:
+            with open('migration-validation-report.json', 'wb') as f:
+                f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2))
+        else:
+            with open('migration-validation-report.json', 'w') as f:
+                json.dump(self.results, f, indent=2)
         
         print(f"\n📄 Detailed report saved to: migration-validation-report.json")
         print("="*60)
@@ -304,10 +528,18 @@ def main():
     if not validator.load_configuration():
         return False
     
-    # Run all validations
-    validator.validate_s3_bulk_migration()
-    validator.validate_s3_replication()
-    validator.validate_dynamodb_sync()
+    # Run all validations concurrently: the replication test writes its
+    # probe under a prefix the bulk check ignores, so the checks can't
+    # interfere and total wall time is the slowest of the three rather
+    # than the sum
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        validations = [
+            executor.submit(validator.validate_s3_bulk_migration),
+            executor.submit(validator.validate_s3_replication),
+            executor.submit(validator.validate_dynamodb_sync)
+        ]
+        for validation in validations:
+            validation.result()
     
     # Generate final report
     validator.generate_final_report()